@@ -14,15 +14,20 @@ Este programa implementa un pipeline de datos completo que:
 
 import logging
 import os
-import json
-from datetime import datetime
-from typing import List, Dict, Any
-from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import List, Dict, Any, Optional, Union
 
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 import requests
 from dotenv import load_dotenv
-from deltalake import write_deltalake, DeltaTable
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # --- Configuración de Logging ---
 logging.basicConfig(
@@ -33,6 +38,44 @@ logger = logging.getLogger(__name__)
 # --- Carga de Variables de Entorno ---
 load_dotenv("config.env")
 
+# Copy-on-Write (siempre activo desde pandas 3): `assign`/`astype` comparten las columnas
+# que no modifican en lugar de duplicar el DataFrame completo antes de escribirlo.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# Tipo de la columna de partición diaria: date32 nativo de Arrow, para que Delta
+# la guarde como fecha (y no como texto) y pueda podar particiones al leer.
+TIPO_FECHA_PARTICION = pd.ArrowDtype(pa.date32())
+
+# Errores de Arrow al inferir o convertir el tipo de un campo (p. ej. valores de tipos mezclados)
+ERRORES_TIPO_ARROW = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError)
+
+# Esquemas conocidos de las respuestas de The News API. Fijan el tipo de cada campo aunque
+# la respuesta no permita inferirlo (p. ej. listas vacías o columnas enteramente nulas).
+# Las fechas llegan como texto ISO 8601 y se parsean al construir 'fecha_publicacion'.
+ESQUEMA_NOTICIAS = pa.schema([
+    ('uuid', pa.string()),
+    ('title', pa.string()),
+    ('description', pa.string()),
+    ('keywords', pa.string()),
+    ('snippet', pa.string()),
+    ('url', pa.string()),
+    ('image_url', pa.string()),
+    ('language', pa.string()),
+    ('published_at', pa.string()),
+    ('source', pa.string()),
+    ('categories', pa.list_(pa.string())),
+    ('relevance_score', pa.float64()),
+    ('locale', pa.string()),
+])
+ESQUEMA_FUENTES = pa.schema([
+    ('source_id', pa.string()),
+    ('domain', pa.string()),
+    ('language', pa.string()),
+    ('locale', pa.string()),
+    ('categories', pa.list_(pa.string())),
+])
+
 
 class PipelineDeNoticias:
     """
@@ -47,31 +90,89 @@ class PipelineDeNoticias:
     API_BASE_URL = os.getenv("API_BASE_URL", "https://api.thenewsapi.com/v1")
     API_TOKEN = os.getenv("API_TOKEN")
 
-    # Rutas de las tablas
-    # Capa Bronze: Datos crudos del origen
-    RUTA_BRONZE_NOTICIAS = f"{DATA_LAKE_BASE}/bronze/thenewsapi/top_stories"
-    RUTA_BRONZE_FUENTES = f"{DATA_LAKE_BASE}/bronze/thenewsapi/sources"
-    # Capa Silver: Datos procesados y enriquecidos
-    RUTA_SILVER_NOTICIAS_ENRIQUECIDAS = f"{DATA_LAKE_BASE}/silver/top_stories_enriched"
-    # Capa Gold: Datos agregados y curados
-    RUTA_GOLD_CONTEO_POR_FUENTE = f"{DATA_LAKE_BASE}/gold/news_count_by_source"
-    # Logs
-    RUTA_LOGS = f"{DATA_LAKE_BASE}/logs"
-
-    def __init__(self, api_key: str = None):
+    # Columnas de las tablas Bronze que se leen para construir la capa Silver
+    COLUMNAS_NOTICIAS_SILVER = ['uuid', 'title', 'description', 'url', 'source', 'fecha_publicacion', 'fecha_particion']
+    COLUMNAS_FUENTES_SILVER = ['source_id', 'domain', 'categories']
+    # Un titular es corto si tiene menos de esta cantidad de caracteres
+    LONGITUD_TITULAR_CORTO = 50
+    # Columnas de baja cardinalidad que se escriben como diccionario (categoría)
+    COLUMNAS_CATEGORICAS = ['endpoint_origen', 'pais_consulta', 'idioma_consulta', 'fuente_nombre']
+
+    # Timeout de las consultas a la API, en segundos: (conexión, lectura)
+    TIMEOUT_API = (5, 30)
+
+    # Propiedades de escritura Parquet (argumentos de deltalake.WriterProperties): ZSTD nivel 1
+    # comprime mejor que Snappy (el default) con un costo de CPU similar al escribir; las páginas
+    # de 1 MiB y los row groups grandes evitan partir cada escritura en muchos bloques pequeños.
+    # Se puede reemplazar, p. ej. para benchmarks.
+    PROPIEDADES_ESCRITURA = {
+        'compression': 'ZSTD',
+        'compression_level': 1,
+        'data_page_size_limit': 1 << 20,
+        'max_row_group_size': 1_000_000,
+    }
+    # Tamaño objetivo de cada archivo Parquet, en bytes: una escritura solo se reparte en
+    # varios archivos por partición al superar este tamaño
+    TAMANIO_ARCHIVO_OBJETIVO = 128 * 1024 * 1024
+
+    def __init__(self, api_key: str = None, data_lake_base: str = None):
         """
         Inicializa el pipeline de noticias.
 
         Args:
             api_key (str, optional): La clave de API para The News API.
                                      Si no se provee, se toma de las variables de entorno.
+            data_lake_base (str, optional): Directorio raíz del Data Lake.
+                                     Si no se provee, se usa `DATA_LAKE_BASE`.
         """
         self.api_key = api_key or self.API_TOKEN
+        if data_lake_base:
+            self.DATA_LAKE_BASE = data_lake_base
+        # Marca de tiempo de la ejecución, compartida por todas las filas y metadatos de la corrida
+        self._marca_tiempo_ejecucion = pd.Timestamp.now()
+        # Metadatos de las operaciones de la ejecución, volcados a disco una sola vez al final
+        self._registro_ejecucion: List[Dict[str, Any]] = []
+        # Indica si hay una ejecución de `ejecutar_pipeline` en curso (que vuelca el registro al terminar)
+        self._ejecucion_en_curso = False
         self.session = requests.Session()
+        # Pool de conexiones persistentes y reintentos ante fallos transitorios de la API
+        adaptador = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+        )
+        self.session.mount("https://", adaptador)
+        self.session.mount("http://", adaptador)
+        self.session.headers["Connection"] = "keep-alive"
         if self.api_key:
             self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
         self._crear_directorios_data_lake()
 
+    # Rutas de las tablas, relativas a `DATA_LAKE_BASE` de la instancia
+    # Capa Bronze: Datos crudos del origen
+    @property
+    def RUTA_BRONZE_NOTICIAS(self) -> str:
+        return f"{self.DATA_LAKE_BASE}/bronze/thenewsapi/top_stories"
+
+    @property
+    def RUTA_BRONZE_FUENTES(self) -> str:
+        return f"{self.DATA_LAKE_BASE}/bronze/thenewsapi/sources"
+
+    # Capa Silver: Datos procesados y enriquecidos
+    @property
+    def RUTA_SILVER_NOTICIAS_ENRIQUECIDAS(self) -> str:
+        return f"{self.DATA_LAKE_BASE}/silver/top_stories_enriched"
+
+    # Capa Gold: Datos agregados y curados
+    @property
+    def RUTA_GOLD_CONTEO_POR_FUENTE(self) -> str:
+        return f"{self.DATA_LAKE_BASE}/gold/news_count_by_source"
+
+    # Logs
+    @property
+    def RUTA_LOGS(self) -> str:
+        return f"{self.DATA_LAKE_BASE}/logs"
+
     def _crear_directorios_data_lake(self):
         """Crea la estructura de directorios necesaria para el Data Lake."""
         directorios = [
@@ -85,6 +186,97 @@ class PipelineDeNoticias:
             os.makedirs(directorio, exist_ok=True)
             logger.info(f"Directorio creado/verificado: {directorio}")
 
+    def _obtener_datos_api(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Consulta un endpoint de la API y decodifica el cuerpo JSON de la respuesta.
+
+        El cuerpo se lee en streaming del socket y se decodifica directamente con orjson,
+        sin que requests lo guarde antes en `response.content`.
+
+        Raises:
+            requests.exceptions.RequestException: Si la consulta falla o excede `TIMEOUT_API`.
+        """
+        response = self.session.get(url, params=params, stream=True, timeout=self.TIMEOUT_API)
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return orjson.loads(response.raw.read())
+        finally:
+            response.close()
+
+    def _construir_dataframe(self, registros: List[Dict[str, Any]], esquema: pa.Schema) -> pd.DataFrame:
+        """
+        Convierte los registros de una respuesta de la API en un DataFrame respaldado por Arrow.
+
+        Los registros se cargan con Arrow como un arreglo de structs, cuyas columnas son la unión
+        de las claves de todos los registros (un campo ausente en algunos queda nulo en ellos).
+        Los campos presentes en `esquema` se tipan con su tipo conocido; los campos adicionales
+        conservan el tipo inferido. Los objetos anidados se aplanan un nivel en columnas con
+        prefijo (p. ej. 'source_id').
+
+        Un registro con un valor inesperado no descarta la respuesta: el campo que no admite un
+        único tipo se guarda como texto y el que no se puede convertir a su tipo conocido
+        conserva el inferido; en ambos casos se registra una advertencia con el nombre del campo.
+
+        Args:
+            registros (List[Dict[str, Any]]): Lista de registros de la clave 'data' de la respuesta.
+            esquema (pa.Schema): Esquema conocido del endpoint.
+
+        Returns:
+            pd.DataFrame: DataFrame con columnas de tipo `pd.ArrowDtype`.
+        """
+        if not registros:
+            return pd.DataFrame()
+        try:
+            tabla = pa.Table.from_struct_array(pa.array(registros))
+        except ERRORES_TIPO_ARROW:
+            tabla = self._cargar_registros_por_campo(registros)
+
+        columnas = []
+        for nombre, columna in zip(tabla.column_names, tabla.columns):
+            if nombre in esquema.names and not pa.types.is_struct(columna.type):
+                tipo = esquema.field(nombre).type
+                try:
+                    columna = columna.cast(tipo)
+                except ERRORES_TIPO_ARROW:
+                    logger.warning(f"El campo '{nombre}' no se pudo convertir a {tipo}; se conserva como {columna.type}.")
+            columnas.append(columna)
+        tabla = pa.table(columnas, names=tabla.column_names).flatten()
+
+        # Un campo anidado aplanado (p. ej. source.id) no debe pisar a un campo de primer nivel
+        # con el mismo nombre (source_id): el aplanado se renombra con el sufijo '_anidado'.
+        nombres_primer_nivel = {nombre for nombre in tabla.column_names if "." not in nombre}
+        nombres = []
+        for nombre in tabla.column_names:
+            nombre_plano = nombre.replace(".", "_")
+            if "." in nombre and nombre_plano in nombres_primer_nivel:
+                logger.warning(f"El campo anidado '{nombre}' coincide con el campo '{nombre_plano}'; se renombra a '{nombre_plano}_anidado'.")
+                nombre_plano = f"{nombre_plano}_anidado"
+            nombres.append(nombre_plano)
+        tabla = tabla.rename_columns(nombres)
+        return tabla.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def _cargar_registros_por_campo(self, registros: List[Dict[str, Any]]) -> pa.Table:
+        """
+        Carga los registros campo por campo, para cuando Arrow no puede inferir un único tipo.
+
+        Cada campo (la unión de las claves de todos los registros) se infiere por separado;
+        si sus valores mezclan tipos, el campo se guarda como texto (JSON para listas y objetos).
+        """
+        nombres = list(dict.fromkeys(clave for registro in registros for clave in registro))
+        columnas = []
+        for nombre in nombres:
+            valores = [registro.get(nombre) for registro in registros]
+            try:
+                columnas.append(pa.array(valores))
+            except ERRORES_TIPO_ARROW:
+                logger.warning(f"El campo '{nombre}' mezcla tipos entre registros; se guarda como texto.")
+                columnas.append(pa.array(
+                    [v if v is None or isinstance(v, str) else orjson.dumps(v).decode() for v in valores],
+                    type=pa.string(),
+                ))
+        return pa.table(columnas, names=nombres)
+
     def extraer_noticias_principales(self, pais: str = None, idioma: str = None, limite: int = None) -> pd.DataFrame:
         """
         Extrae las noticias principales desde el endpoint /news/top de la API.
@@ -99,16 +291,14 @@ class PipelineDeNoticias:
             url = f"{self.API_BASE_URL}{endpoint}"
             params = {"api_token": self.api_key, "locale": pais, "language": idioma, "limit": limite}
 
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._obtener_datos_api(url, params)
 
             if "data" not in data:
                 logger.error("La respuesta de la API no contiene la clave 'data'")
                 return pd.DataFrame()
 
-            df = pd.DataFrame(data["data"])
-            df["fecha_extraccion"] = datetime.now()
+            df = self._construir_dataframe(data["data"], ESQUEMA_NOTICIAS)
+            df["fecha_extraccion"] = self._marca_tiempo_ejecucion
             df["endpoint_origen"] = "top_stories"
             df["pais_consulta"] = pais
             df["idioma_consulta"] = idioma
@@ -121,7 +311,7 @@ class PipelineDeNoticias:
 
             if date_col:
                 df["fecha_publicacion"] = pd.to_datetime(df[date_col])
-                df["fecha_particion"] = df["fecha_publicacion"].dt.date
+                df["fecha_particion"] = df["fecha_publicacion"].dt.date.astype(TIPO_FECHA_PARTICION)
                 # No se particiona por hora, solo por día
 
             logger.info(f"Se extrajeron {len(df)} noticias principales")
@@ -144,16 +334,14 @@ class PipelineDeNoticias:
             url = f"{self.API_BASE_URL}{endpoint}"
             params = {"api_token": self.api_key, "locale": os.getenv("DEFAULT_COUNTRY", "us"), "language": os.getenv("DEFAULT_LANGUAGE", "en")}
 
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+            data = self._obtener_datos_api(url, params)
 
             if "data" not in data:
                 logger.error("La respuesta de la API no contiene la clave 'data'")
                 return pd.DataFrame()
 
-            df = pd.DataFrame(data["data"])
-            df["fecha_extraccion"] = datetime.now()
+            df = self._construir_dataframe(data["data"], ESQUEMA_FUENTES)
+            df["fecha_extraccion"] = self._marca_tiempo_ejecucion
             df["endpoint_origen"] = "sources"
             logger.info(f"Se extrajeron {len(df)} fuentes")
             return df
@@ -165,44 +353,119 @@ class PipelineDeNoticias:
             logger.error(f"Error inesperado extrayendo fuentes: {e}")
             return pd.DataFrame()
 
-    def guardar_en_delta_lake(self, df: pd.DataFrame, ruta_tabla: str, modo: str = 'append', particionado_por: List[str] = None):
+    def guardar_en_delta_lake(self, df: Union[pd.DataFrame, pa.Table], ruta_tabla: str, modo: str = 'append', particionado_por: List[str] = None, predicado: str = None, devolver_tabla: bool = False) -> Optional[pa.Table]:
         """
-        Guarda un DataFrame en una tabla Delta Lake.
+        Guarda un DataFrame (o una tabla Arrow ya tipada) en una tabla Delta Lake.
+
+        El DataFrame recibido no se modifica ni se copia completo: solo se generan
+        las columnas que necesitan conversión antes de pasar los datos a Arrow.
+        Las tablas Arrow se escriben tal cual.
 
         Args:
-            df (pd.DataFrame): El DataFrame a guardar.
+            df (pd.DataFrame | pa.Table): Los datos a guardar.
             ruta_tabla (str): La ruta de la tabla Delta.
             modo (str): 'append' o 'overwrite'. Si es 'overwrite' y la tabla está particionada,
                       se activa el modo de sobreescritura dinámica, reemplazando solo las
                       particiones presentes en el DataFrame actual.
             particionado_por (List[str], optional): Lista de columnas por las que particionar.
+            predicado (str, optional): Con modo 'overwrite', reemplaza solo las filas que cumplen
+                      el predicado SQL (p. ej. "fecha_particion = '2025-08-22'") y conserva el resto.
+            devolver_tabla (bool): Si es True, devuelve la tabla Arrow escrita, para que el paso
+                      siguiente la use en memoria sin volver a leerla de Delta Lake.
+
+        Returns:
+            pa.Table | None: La tabla escrita si `devolver_tabla` es True y la escritura fue exitosa.
         """
+        # deltalake carga su extensión nativa al importarse: se difiere hasta que se escribe
+        from deltalake import DeltaTable, WriterProperties, write_deltalake
+
         try:
-            if df.empty:
+            if len(df) == 0:
                 logger.warning(f"El DataFrame para '{ruta_tabla}' está vacío, no se guardará.")
                 return
 
-            df_limpio = df.copy()
-            for col in df_limpio.columns:
-                if df_limpio[col].dtype == 'object':
-                    df_limpio[col] = df_limpio[col].astype(str).fillna('')
-                elif pd.api.types.is_datetime64_any_dtype(df_limpio[col]):
-                    df_limpio[col] = df_limpio[col].astype(str).fillna('')
-
-            write_deltalake(ruta_tabla, df_limpio, mode=modo, partition_by=particionado_por, schema_mode="merge")
+            if isinstance(df, pa.Table):
+                tabla = df
+            else:
+                # Las columnas de fecha se mantienen como timestamp nativo; solo se convierten a texto
+                # las columnas 'object' (listas, valores mixtos) que Delta Lake no puede tipar.
+                # El resto de las columnas pasa a Arrow sin copiar el DataFrame completo.
+                columnas_objeto = df.columns[df.dtypes == 'object']
+                columnas_texto = df[columnas_objeto].astype(str).fillna('')
+                # Las columnas con pocos valores distintos viajan a Arrow codificadas como diccionario
+                columnas_categoricas = df.columns.intersection(self.COLUMNAS_CATEGORICAS)
+                df_limpio = df.assign(**dict(columnas_texto.items())).astype(dict.fromkeys(columnas_categoricas, 'category'))
+                tabla = pa.Table.from_pandas(df_limpio, preserve_index=False)
+
+            # Al sobreescribir, el esquema nuevo reemplaza al anterior (p. ej. tablas con fechas guardadas como texto).
+            # Si solo se reemplaza una parte de la tabla (predicado), el resto conserva su esquema.
+            modo_esquema = "overwrite" if modo == 'overwrite' and not predicado else "merge"
+            if modo_esquema == "overwrite":
+                # Una sobreescritura completa también reemplaza el particionado de la tabla existente
+                # (p. ej. fuentes, antes particionada por 'categories'); sin una lista explícita,
+                # delta-rs conservaría las columnas de partición anteriores y la escritura fallaría.
+                particionado_por = particionado_por or []
+                if DeltaTable.is_deltatable(ruta_tabla):
+                    particionado_actual = DeltaTable(ruta_tabla).metadata().partition_columns
+                    if particionado_actual != particionado_por:
+                        logger.warning(
+                            f"Se reemplaza el particionado de '{ruta_tabla}': {particionado_actual} -> {particionado_por}"
+                        )
+            write_deltalake(
+                ruta_tabla, tabla, mode=modo, partition_by=particionado_por, schema_mode=modo_esquema, predicate=predicado,
+                target_file_size=self.TAMANIO_ARCHIVO_OBJETIVO, writer_properties=WriterProperties(**self.PROPIEDADES_ESCRITURA),
+            )
             logger.info(f"Datos guardados en Delta Lake: {ruta_tabla} (Modo: {modo})")
-            self._guardar_metadatos_pipeline(os.path.basename(ruta_tabla), len(df_limpio), ruta_tabla, modo)
+            self._guardar_metadatos_pipeline(os.path.basename(ruta_tabla), tabla.num_rows, ruta_tabla, modo)
+            if devolver_tabla:
+                return tabla
 
         except Exception as e:
             logger.error(f"Error guardando en Delta Lake para '{ruta_tabla}': {e}")
 
-    def procesar_y_enriquecer_datos(self, ruta_noticias_crudas: str, ruta_fuentes_crudas: str, ruta_tabla_procesada: str):
+    def _leer_columnas_delta(self, ruta_tabla: Union[str, pa.Table], columnas: List[str], filtros: List[tuple] = None) -> pd.DataFrame:
+        """
+        Lee de una tabla Delta (o de una tabla Arrow ya en memoria) solo las columnas indicadas.
+
+        Las columnas que no existen en el esquema de la tabla (p. ej. 'categories' en fuentes)
+        se omiten. Al ser Parquet un formato columnar, el resto de las columnas no se lee del disco.
+        Los `filtros` sobre columnas de partición (p. ej. [('fecha_particion', '=', date(2025, 8, 22))])
+        descartan los archivos de las demás particiones sin abrirlos.
+        El DataFrame resultante conserva los buffers de Arrow (`pd.ArrowDtype`), sin convertir
+        textos y fechas a objetos de Python.
+        """
+        if isinstance(ruta_tabla, pa.Table):
+            tabla_arrow = ruta_tabla.select([col for col in columnas if col in ruta_tabla.column_names])
+            if filtros:
+                tabla_arrow = tabla_arrow.filter(pq.filters_to_expression(filtros))
+            return tabla_arrow.to_pandas(types_mapper=pd.ArrowDtype)
+
+        from deltalake import DeltaTable
+
+        tabla = DeltaTable(ruta_tabla)
+        columnas_disponibles = {campo.name for campo in tabla.schema().fields}
+        tabla_arrow = tabla.to_pyarrow_table(columns=[col for col in columnas if col in columnas_disponibles], filters=filtros)
+        return tabla_arrow.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def procesar_y_enriquecer_datos(
+        self, ruta_noticias_crudas: str, ruta_fuentes_crudas: str, ruta_tabla_procesada: str, fecha_particion: date = None,
+        tabla_noticias_crudas: pa.Table = None, tabla_fuentes_crudas: pa.Table = None,
+    ):
         """
         Carga los datos crudos, los procesa, enriquece y guarda el resultado.
+
+        Args:
+            fecha_particion (date, optional): Si se indica, solo se leen las noticias crudas de esa
+                partición diaria y en la tabla procesada solo se reemplaza esa misma partición.
+            tabla_noticias_crudas, tabla_fuentes_crudas (pa.Table, optional): Datos crudos ya en
+                memoria (p. ej. devueltos por `guardar_en_delta_lake(..., devolver_tabla=True)`).
+                Si se indican, se usan en lugar de leer la tabla Delta correspondiente.
         """
         try:
             logger.info(f"Iniciando procesamiento y enriquecimiento desde: {ruta_noticias_crudas}")
-            df_noticias = DeltaTable(ruta_noticias_crudas).to_pandas()
+            filtros = [('fecha_particion', '=', fecha_particion)] if fecha_particion else None
+            origen_noticias = ruta_noticias_crudas if tabla_noticias_crudas is None else tabla_noticias_crudas
+            df_noticias = self._leer_columnas_delta(origen_noticias, self.COLUMNAS_NOTICIAS_SILVER, filtros)
 
             if df_noticias.empty:
                 logger.warning("La tabla de noticias crudas está vacía. No hay nada que procesar.")
@@ -211,36 +474,65 @@ class PipelineDeNoticias:
             logger.info(f"Leídos {len(df_noticias)} registros de noticias crudas.")
 
             filas_iniciales = len(df_noticias)
-            df_noticias = df_noticias.drop_duplicates(subset=['uuid'])
+            # Primera aparición de cada uuid (los nulos cuentan como un mismo valor): `duplicated`
+            # recorre la columna una sola vez con una tabla hash, sin ordenar, y conserva el orden original.
+            df_noticias = df_noticias.loc[~df_noticias['uuid'].duplicated(keep='first')].reset_index(drop=True)
             logger.info(f"Transformación 1: Eliminados {filas_iniciales - len(df_noticias)} duplicados.")
 
             df_noticias = df_noticias.rename(columns={'source': 'fuente_id'})
             logger.info("Transformación 2: Columnas renombradas.")
 
-            df_noticias['es_titular_corto'] = df_noticias['title'].str.len() < 50
+            # Las transformaciones 3 a 5 son independientes entre sí: se calculan como arreglos y se
+            # incorporan al DataFrame en una única asignación, en lugar de una asignación por columna.
+            # La comparación se hace sobre el arreglo NumPy de longitudes y produce directamente un
+            # arreglo bool nativo; los títulos nulos (longitud NaN) no cuentan como cortos.
+            longitudes_titulo = df_noticias['title'].str.len().to_numpy(dtype='float64', na_value=np.nan)
+            # Equivalente vectorizado de urlparse(url).netloc: todo lo que sigue a 'esquema://' hasta '/', '?' o '#'.
+            # Como urlparse, una URL sin esquema da '' y una URL nula da nulo.
+            # Sobre 'string[pyarrow]' la extracción corre con los kernels UTF-8 de Arrow.
+            urls = df_noticias['url'].astype('string[pyarrow]')
+            dominios = urls.str.extract(r'^[A-Za-z][A-Za-z0-9+.-]*://([^/?#]*)', expand=False).fillna('').where(urls.notna())
+            df_noticias = df_noticias.assign(
+                es_titular_corto=np.less(longitudes_titulo, self.LONGITUD_TITULAR_CORTO),
+                description=df_noticias['description'].fillna('Sin descripción'),
+                dominio_fuente=dominios,
+            )
             logger.info("Transformación 3: Creada columna 'es_titular_corto'.")
-
-            df_noticias['description'] = df_noticias['description'].fillna('Sin descripción')
             logger.info("Transformación 4: Nulos rellenados en 'description'.")
-
-            df_noticias['dominio_fuente'] = df_noticias['url'].apply(lambda x: urlparse(x).netloc if pd.notna(x) else None)
             logger.info("Transformación 5: Creada columna 'dominio_fuente' desde la URL.")
 
             logger.info("Iniciando join con datos de fuentes...")
-            df_fuentes = DeltaTable(ruta_fuentes_crudas).to_pandas()
+            origen_fuentes = ruta_fuentes_crudas if tabla_fuentes_crudas is None else tabla_fuentes_crudas
+            df_fuentes = self._leer_columnas_delta(origen_fuentes, self.COLUMNAS_FUENTES_SILVER)
             df_fuentes = df_fuentes.rename(columns={'source_id': 'fuente_id', 'domain': 'fuente_nombre'})
             
-            columnas_a_unir = ['fuente_id', 'fuente_nombre']
+            columnas_a_unir = ['fuente_nombre']
             if 'categories' in df_fuentes.columns:
                 columnas_a_unir.append('categories')
+            # Una fila por fuente, para que el join no multiplique noticias
+            df_fuentes = df_fuentes.drop_duplicates('fuente_id')
+
+            # Join por códigos enteros: factorize numera los 'fuente_id' de ambos lados en un mismo
+            # espacio de códigos, así la tabla hash del join se arma sobre enteros y no sobre textos.
+            # Los ids nulos reciben el código -1 y no se unen con ninguna fuente.
+            codigos_fuente, _ = pd.factorize(pd.concat([df_noticias['fuente_id'], df_fuentes['fuente_id']], ignore_index=True))
+            codigos_noticias = codigos_fuente[:len(df_noticias)]
+            codigos_fuentes = codigos_fuente[len(df_noticias):]
+            df_fuentes_por_codigo = df_fuentes[columnas_a_unir].set_axis(codigos_fuentes)[codigos_fuentes >= 0]
+
+            df_enriquecido = (
+                df_noticias.assign(_codigo_fuente=codigos_noticias)
+                .join(df_fuentes_por_codigo, on='_codigo_fuente', how='left', validate='m:1')
+                .drop(columns='_codigo_fuente')
+            )
 
-            df_enriquecido = pd.merge(df_noticias, df_fuentes[columnas_a_unir], left_on='dominio_fuente', right_on='fuente_nombre', how='left')
-
-            df_enriquecido['es_titular_corto'] = df_enriquecido['es_titular_corto'].astype(bool)
             if 'fecha_particion' in df_enriquecido.columns:
-                df_enriquecido['fecha_particion'] = pd.to_datetime(df_enriquecido['fecha_particion'])
+                df_enriquecido['fecha_particion'] = pd.to_datetime(df_enriquecido['fecha_particion']).dt.date.astype(TIPO_FECHA_PARTICION)
 
-            self.guardar_en_delta_lake(df_enriquecido, ruta_tabla_procesada, modo='overwrite', particionado_por=['fecha_particion'])
+            predicado = f"fecha_particion = '{fecha_particion.isoformat()}'" if fecha_particion else None
+            self.guardar_en_delta_lake(
+                df_enriquecido, ruta_tabla_procesada, modo='overwrite', particionado_por=['fecha_particion'], predicado=predicado
+            )
 
         except Exception as e:
             logger.error(f"Error durante el procesamiento de datos: {e}", exc_info=True)
@@ -248,26 +540,62 @@ class PipelineDeNoticias:
     def agregar_datos(self, ruta_tabla_procesada: str, ruta_tabla_agregada: str):
         """
         Genera una tabla agregada a partir de los datos procesados.
+
+        La agregación se hace íntegramente en Arrow: se escanean solo las columnas
+        necesarias de la tabla Silver y se agrupan con el hash aggregate de Arrow,
+        sin materializar la capa Silver como DataFrame de pandas.
         """
+        from deltalake import DeltaTable
+
         try:
-            df_procesado = DeltaTable(ruta_tabla_procesada).to_pandas()
-            if df_procesado.empty:
+            tabla_procesada = DeltaTable(ruta_tabla_procesada).to_pyarrow_dataset().to_table(columns=['fuente_nombre', 'uuid'])
+            if tabla_procesada.num_rows == 0:
                 logger.warning("DataFrame procesado vacío, no se puede agregar.")
                 return
 
             logger.info("Iniciando agregación de datos por fuente...")
-            df_procesado['fuente_nombre'] = df_procesado['fuente_nombre'].fillna('Fuente Desconocida')
-            df_agregado = df_procesado.groupby('fuente_nombre').agg(cantidad_noticias=('uuid', 'count')).reset_index()
-            logger.info(f"Agregación completada. {len(df_agregado)} fuentes agregadas.")
-
-            self.guardar_en_delta_lake(df_agregado, ruta_tabla_agregada, modo='overwrite')
+            tabla_procesada = tabla_procesada.set_column(
+                0, 'fuente_nombre', pc.fill_null(tabla_procesada['fuente_nombre'], 'Fuente Desconocida')
+            )
+            conteo = tabla_procesada.group_by('fuente_nombre').aggregate([('uuid', 'count')])
+            # Ordenada por fuente: el resultado no depende del orden en que el hash aggregate encuentra los grupos
+            tabla_agregada = pa.table({
+                'fuente_nombre': conteo['fuente_nombre'],
+                'cantidad_noticias': conteo['uuid_count'],
+            }).sort_by('fuente_nombre')
+            logger.info(f"Agregación completada. {tabla_agregada.num_rows} fuentes agregadas.")
+
+            self.guardar_en_delta_lake(tabla_agregada, ruta_tabla_agregada, modo='overwrite')
 
         except Exception as e:
             logger.error(f"Error durante la agregación de datos: {e}")
 
+    def _extraer_y_guardar_bronze_noticias(self) -> pd.DataFrame:
+        """
+        Extrae las noticias principales y las guarda en la capa Bronze.
+        """
+        df_noticias = self.extraer_noticias_principales()
+        if not df_noticias.empty:
+            self.guardar_en_delta_lake(df_noticias, self.RUTA_BRONZE_NOTICIAS, modo='overwrite', particionado_por=["fecha_particion"])
+        return df_noticias
+
+    def _extraer_y_guardar_bronze_fuentes(self) -> pd.DataFrame:
+        """
+        Extrae las fuentes de noticias y las guarda en la capa Bronze.
+        """
+        df_fuentes = self.extraer_fuentes()
+        if not df_fuentes.empty:
+            # Tabla de dimensión pequeña: sin particionar, para no generar un archivo diminuto por categoría
+            self.guardar_en_delta_lake(df_fuentes, self.RUTA_BRONZE_FUENTES, modo='overwrite')
+        return df_fuentes
+
     def _guardar_metadatos_pipeline(self, nombre_tabla: str, num_registros: int, ruta_archivo: str, operacion: str):
         """
-        Guarda metadatos de una operación del pipeline en un archivo JSON.
+        Registra en memoria los metadatos de una operación del pipeline.
+
+        Durante `ejecutar_pipeline` los metadatos se acumulan y se escriben todos juntos
+        al terminar, evitando un archivo pequeño por operación. Las operaciones llamadas
+        directamente (fuera de una ejecución) se escriben en el momento, cada una en su archivo.
         """
         metadatos = {
             "nombre_tabla": nombre_tabla,
@@ -277,10 +605,27 @@ class PipelineDeNoticias:
             "operacion": operacion,
             "formato": "delta_lake",
         }
-        ruta_metadatos = f"{self.RUTA_LOGS}/{nombre_tabla}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(ruta_metadatos, "w") as f:
-            json.dump(metadatos, f, indent=4)
-        logger.info(f"Metadatos de operación guardados: {ruta_metadatos}")
+        self._registro_ejecucion.append(metadatos)
+        logger.info(f"Metadatos de operación registrados: {nombre_tabla}")
+        if not self._ejecucion_en_curso:
+            self._volcar_metadatos_ejecucion(f"{nombre_tabla}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+
+    def _volcar_metadatos_ejecucion(self, nombre_archivo: str = None):
+        """
+        Escribe en un único archivo JSON los metadatos acumulados y vacía el registro.
+
+        Args:
+            nombre_archivo (str, optional): Nombre del archivo, sin extensión.
+                Por defecto, 'run_<marca de tiempo de la ejecución>'.
+        """
+        if not self._registro_ejecucion:
+            return
+        nombre_archivo = nombre_archivo or f"run_{self._marca_tiempo_ejecucion.strftime('%Y%m%d_%H%M%S')}"
+        ruta_metadatos = f"{self.RUTA_LOGS}/{nombre_archivo}.json"
+        with open(ruta_metadatos, "wb") as f:
+            f.write(orjson.dumps(self._registro_ejecucion, option=orjson.OPT_INDENT_2))
+        self._registro_ejecucion = []
+        logger.info(f"Metadatos de la ejecución guardados: {ruta_metadatos}")
 
     def ejecutar_pipeline(self) -> Dict[str, Any]:
         """
@@ -288,34 +633,45 @@ class PipelineDeNoticias:
 
         El pipeline está diseñado para ser idempotente. Re-ejecutar el pipeline
         para el mismo período de tiempo producirá el mismo resultado en el Data Lake.
+        Al finalizar, incluso ante un error, se guardan los metadatos de la ejecución.
         """
         logger.info("Iniciando pipeline de datos completo")
+        self._marca_tiempo_ejecucion = pd.Timestamp.now()
+        self._ejecucion_en_curso = True
 
-        logger.info("=== Fase 1: Extracción de Datos ===")
-        df_noticias = self.extraer_noticias_principales()
-        if not df_noticias.empty:
-            self.guardar_en_delta_lake(df_noticias, self.RUTA_BRONZE_NOTICIAS, modo='overwrite', particionado_por=["fecha_particion"])
-
-        df_fuentes = self.extraer_fuentes()
-        if not df_fuentes.empty:
-            self.guardar_en_delta_lake(df_fuentes, self.RUTA_BRONZE_FUENTES, modo='overwrite', particionado_por=["categories"] if "categories" in df_fuentes.columns else None)
-
-        logger.info("=== Fase 2: Procesamiento y Enriquecimiento de Datos ===")
-        self.procesar_y_enriquecer_datos(self.RUTA_BRONZE_NOTICIAS, self.RUTA_BRONZE_FUENTES, self.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS)
-
-        logger.info("=== Fase 3: Agregación de Datos ===")
-        self.agregar_datos(self.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS, self.RUTA_GOLD_CONTEO_POR_FUENTE)
-
-        logger.info("Pipeline de datos completado")
-        
-        df_procesado = DeltaTable(self.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS).to_pandas()
-
-        return {
-            "noticias_extraidas": len(df_noticias),
-            "fuentes_extraidas": len(df_fuentes),
-            "noticias_procesadas": len(df_procesado),
-            "fuentes_agregadas": len(df_procesado.groupby('fuente_nombre')) if not df_procesado.empty else 0
-        }
+        try:
+            logger.info("=== Fase 1: Extracción de Datos ===")
+            # Noticias y fuentes son independientes: la extracción (latencia de red) y la escritura
+            # (delta-rs libera el GIL) de una se solapan con las de la otra, en tablas distintas.
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futuro_noticias = executor.submit(self._extraer_y_guardar_bronze_noticias)
+                futuro_fuentes = executor.submit(self._extraer_y_guardar_bronze_fuentes)
+                df_noticias = futuro_noticias.result()
+                df_fuentes = futuro_fuentes.result()
+
+            logger.info("=== Fase 2: Procesamiento y Enriquecimiento de Datos ===")
+            self.procesar_y_enriquecer_datos(self.RUTA_BRONZE_NOTICIAS, self.RUTA_BRONZE_FUENTES, self.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS)
+
+            logger.info("=== Fase 3: Agregación de Datos ===")
+            self.agregar_datos(self.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS, self.RUTA_GOLD_CONTEO_POR_FUENTE)
+
+            logger.info("Pipeline de datos completado")
+
+            # Para el resumen solo hace falta la columna de fuente
+            df_procesado = self._leer_columnas_delta(self.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS, ['fuente_nombre'])
+            # Cantidad de fuentes distintas (sin nulos): factorize codifica la columna en un solo
+            # paso, sin construir el objeto GroupBy solo para contar los grupos.
+            _, fuentes_unicas = pd.factorize(df_procesado['fuente_nombre'])
+
+            return {
+                "noticias_extraidas": len(df_noticias),
+                "fuentes_extraidas": len(df_fuentes),
+                "noticias_procesadas": len(df_procesado),
+                "fuentes_agregadas": len(fuentes_unicas)
+            }
+        finally:
+            self._ejecucion_en_curso = False
+            self._volcar_metadatos_ejecucion()
 
 def main():
     """
@@ -9,5 +9,32 @@ Agrega el directorio raíz del proyecto al path de Python para que los módulos
 import sys
 import os
 
+import pytest
+
 # Añadir el directorio raíz del proyecto al sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def pytest_addoption(parser):
+    """Agrega la opción para correr las pruebas de rendimiento, excluidas por defecto."""
+    parser.addoption(
+        "--run-benchmark", action="store_true", default=False,
+        help="ejecutar también las pruebas marcadas como benchmark"
+    )
+
+
+def pytest_configure(config):
+    """Registra las marcas propias del proyecto."""
+    config.addinivalue_line(
+        "markers", "benchmark: pruebas con volúmenes grandes de datos (solo corren con --run-benchmark)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Omite las pruebas marcadas como benchmark salvo que se pida --run-benchmark."""
+    if config.getoption("--run-benchmark"):
+        return
+    omitir = pytest.mark.skip(reason="prueba de rendimiento: usar --run-benchmark para ejecutarla")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(omitir)
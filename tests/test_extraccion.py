@@ -2,16 +2,24 @@
 Pruebas para el módulo de extracción de datos del pipeline.
 """
 
+import orjson
+import pandas as pd
+import pyarrow as pa
 import pytest
 import requests
 from unittest.mock import MagicMock
 
 from NicolasBarra_TP1 import PipelineDeNoticias
 
-@pytest.fixture
-def pipeline() -> PipelineDeNoticias:
-    """Fixture que provee una instancia del pipeline."""
-    return PipelineDeNoticias()
+@pytest.fixture(scope="session")
+def pipeline(tmp_path_factory) -> PipelineDeNoticias:
+    """
+    Fixture que provee una instancia del pipeline, compartida por todas las pruebas.
+
+    Las pruebas solo parchean `session.get` con `mocker.patch.object`, que se revierte
+    al terminar cada prueba, así que la instancia no arrastra estado entre ellas.
+    """
+    return PipelineDeNoticias(data_lake_base=str(tmp_path_factory.mktemp('dl')))
 
 def test_extraer_noticias_principales_exito(pipeline, mocker):
     """Prueba la extracción exitosa de noticias principales."""
@@ -24,7 +32,7 @@ def test_extraer_noticias_principales_exito(pipeline, mocker):
     }
     mock_response = MagicMock()
     mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = api_response_data
+    mock_response.raw.read.return_value = orjson.dumps(api_response_data)
     mocker.patch.object(pipeline.session, 'get', return_value=mock_response)
 
     # 2. Acción (Act)
@@ -58,7 +66,7 @@ def test_extraer_fuentes_exito(pipeline, mocker):
     }
     mock_response = MagicMock()
     mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = api_response_data
+    mock_response.raw.read.return_value = orjson.dumps(api_response_data)
     mocker.patch.object(pipeline.session, 'get', return_value=mock_response)
 
     # 2. Acción
@@ -75,7 +83,7 @@ def test_extraer_fuentes_sin_datos(pipeline, mocker):
     api_response_data = {'metadata': 'sin datos'}
     mock_response = MagicMock()
     mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = api_response_data
+    mock_response.raw.read.return_value = orjson.dumps(api_response_data)
     mocker.patch.object(pipeline.session, 'get', return_value=mock_response)
 
     # 2. Acción
@@ -83,3 +91,114 @@ def test_extraer_fuentes_sin_datos(pipeline, mocker):
 
     # 3. Aserción
     assert df.empty
+
+def test_extraer_noticias_principales_aplana_campos_anidados(pipeline, mocker):
+    """Prueba que los objetos anidados de la respuesta se aplanen en columnas."""
+    # 1. Preparación
+    api_response_data = {
+        'data': [
+            {'uuid': '1', 'title': 'Noticia 1', 'published_on': '2025-08-22T10:00:00',
+             'source': {'id': 'fuente1', 'name': 'Fuente Uno'}}
+        ]
+    }
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.raw.read.return_value = orjson.dumps(api_response_data)
+    mocker.patch.object(pipeline.session, 'get', return_value=mock_response)
+
+    # 2. Acción
+    df = pipeline.extraer_noticias_principales()
+
+    # 3. Aserción
+    assert 'source_id' in df.columns
+    assert df['source_name'].iloc[0] == 'Fuente Uno'
+
+def test_extraer_noticias_principales_tipa_campos_conocidos(pipeline, mocker):
+    """Prueba que los campos del esquema conocido se tipen aunque no se puedan inferir."""
+    # 1. Preparación
+    api_response_data = {
+        'data': [
+            {'uuid': '1', 'title': 'Noticia 1', 'published_on': '2025-08-22T10:00:00',
+             'categories': [], 'relevance_score': None}
+        ]
+    }
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.raw.read.return_value = orjson.dumps(api_response_data)
+    mocker.patch.object(pipeline.session, 'get', return_value=mock_response)
+
+    # 2. Acción
+    df = pipeline.extraer_noticias_principales()
+
+    # 3. Aserción
+    assert df['relevance_score'].dtype == pd.ArrowDtype(pa.float64())
+    assert df['categories'].dtype == pd.ArrowDtype(pa.list_(pa.string()))
+
+def test_extraer_noticias_principales_conserva_campos_ausentes_en_el_primer_registro(pipeline, mocker):
+    """Prueba que un campo ausente en el primer registro no se pierda para el resto."""
+    # 1. Preparación
+    api_response_data = {
+        'data': [
+            {'uuid': '1', 'title': 'Noticia 1', 'published_on': '2025-08-22T10:00:00'},
+            {'uuid': '2', 'title': 'Noticia 2', 'published_on': '2025-08-22T11:00:00',
+             'description': 'desc 2', 'url': 'http://example.com/2'}
+        ]
+    }
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.raw.read.return_value = orjson.dumps(api_response_data)
+    mocker.patch.object(pipeline.session, 'get', return_value=mock_response)
+
+    # 2. Acción
+    df = pipeline.extraer_noticias_principales()
+
+    # 3. Aserción
+    assert {'description', 'url'} <= set(df.columns)
+    assert df['description'].isna().iloc[0]
+    assert df['url'].iloc[1] == 'http://example.com/2'
+
+def test_extraer_noticias_principales_tolera_registros_heterogeneos(pipeline, mocker):
+    """Prueba que un registro con tipos inesperados no descarte el resto de la respuesta."""
+    # 1. Preparación: el segundo registro trae relevance_score como texto y categories como texto
+    api_response_data = {
+        'data': [
+            {'uuid': '1', 'title': 'Noticia 1', 'published_on': '2025-08-22T10:00:00',
+             'relevance_score': 1, 'categories': ['tech']},
+            {'uuid': '2', 'title': 'Noticia 2', 'published_on': '2025-08-22T11:00:00',
+             'relevance_score': 'alto', 'categories': 'sports'}
+        ]
+    }
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.raw.read.return_value = orjson.dumps(api_response_data)
+    mocker.patch.object(pipeline.session, 'get', return_value=mock_response)
+
+    # 2. Acción
+    df = pipeline.extraer_noticias_principales()
+
+    # 3. Aserción
+    assert df['uuid'].tolist() == ['1', '2']
+    assert df['relevance_score'].tolist() == ['1', 'alto']
+    assert df['categories'].tolist() == ['["tech"]', 'sports']
+
+def test_extraer_noticias_principales_renombra_campo_anidado_repetido(pipeline, mocker):
+    """Prueba que un campo anidado aplanado no duplique el nombre de un campo de primer nivel."""
+    # 1. Preparación
+    api_response_data = {
+        'data': [
+            {'uuid': '1', 'title': 'Noticia 1', 'published_on': '2025-08-22T10:00:00',
+             'source_id': 'fuente1', 'source': {'id': 'otra'}}
+        ]
+    }
+    mock_response = MagicMock()
+    mock_response.raise_for_status.return_value = None
+    mock_response.raw.read.return_value = orjson.dumps(api_response_data)
+    mocker.patch.object(pipeline.session, 'get', return_value=mock_response)
+
+    # 2. Acción
+    df = pipeline.extraer_noticias_principales()
+
+    # 3. Aserción
+    assert df.columns.is_unique
+    assert df['source_id'].iloc[0] == 'fuente1'
+    assert df['source_id_anidado'].iloc[0] == 'otra'
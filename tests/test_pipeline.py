@@ -2,56 +2,86 @@
 Prueba de integración para el pipeline completo.
 """
 
+import json
+import orjson
 import pytest
-from unittest.mock import MagicMock
-import pandas as pd
-from datetime import datetime
 
 from NicolasBarra_TP1 import PipelineDeNoticias
 from deltalake import DeltaTable
 
-@pytest.fixture
-def pipeline_integracion(tmp_path, mocker):
+# Datos simulados que devolverá la API
+_NOTICIAS_API_DATA = {
+    'data': [
+        {'uuid': '1', 'title': 'Noticia 1', 'source': 'fuente1', 'published_on': '2025-08-22T10:00:00',
+         'description': 'desc 1', 'keywords': 'k1', 'snippet': 'snip 1', 'url': 'http://example.com/1',
+         'image_url': 'http://example.com/1.jpg', 'language': 'es', 'categories': ['tech'],
+         'relevance_score': 1.0, 'locale': 'us'},
+        {'uuid': '2', 'title': 'Noticia 2', 'source': 'fuente2', 'published_on': '2025-08-22T11:00:00',
+         'description': 'desc 2', 'keywords': 'k2', 'snippet': 'snip 2', 'url': 'http://example.org/2',
+         'image_url': 'http://example.org/2.jpg', 'language': 'en', 'categories': ['sports'],
+         'relevance_score': 2.0, 'locale': 'us'}
+    ]
+}
+_FUENTES_API_DATA = {
+    'data': [
+        {'source_id': 'fuente1', 'domain': 'Fuente Uno', 'language': 'es', 'locale': 'us', 'categories': ['cat1']},
+        {'source_id': 'fuente2', 'domain': 'Fuente Dos', 'language': 'en', 'locale': 'us', 'categories': ['cat2']}
+    ]
+}
+
+
+class _Cuerpo:
+    """Cuerpo de una respuesta simulada: expone lo que usa el pipeline de `response.raw`."""
+    __slots__ = ('_contenido', 'decode_content')
+
+    def __init__(self, contenido: bytes):
+        self._contenido = contenido
+        self.decode_content = False
+
+    def read(self) -> bytes:
+        return self._contenido
+
+
+class _Resp:
+    """
+    Respuesta HTTP simulada, más liviana que un MagicMock.
+
+    Implementa solo la interfaz que usa `_obtener_datos_api`: `raise_for_status`,
+    `raw.read()` y `close`.
+    """
+    __slots__ = ('raw',)
+
+    def __init__(self, datos):
+        self.raw = _Cuerpo(orjson.dumps(datos))
+
+    def raise_for_status(self):
+        return None
+
+    def close(self):
+        return None
+
+
+# Las respuestas simuladas solo se leen, así que se construyen una sola vez
+_MOCK_NOTICIAS_RESPONSE = _Resp(_NOTICIAS_API_DATA)
+_MOCK_FUENTES_RESPONSE = _Resp(_FUENTES_API_DATA)
+
+@pytest.fixture(scope="module")
+def pipeline_integracion(tmp_path_factory, module_mocker):
     """
-    Fixture para la prueba de integración.
+    Fixture para la prueba de integración, creada una sola vez por módulo.
 
     - Provee una instancia del pipeline con un data lake temporal.
     - Parchea las llamadas a la API para no depender de la red.
     """
-    pipeline_instance = PipelineDeNoticias()
-    pipeline_instance.DATA_LAKE_BASE = str(tmp_path)
-    pipeline_instance._crear_directorios_data_lake()
-
-    # Datos simulados que devolverá la API
-    noticias_api_data = {
-        'data': [
-            {'uuid': '1', 'title': 'Noticia 1', 'source': 'fuente1', 'published_on': '2025-08-22T10:00:00',
-             'description': 'desc 1', 'keywords': 'k1', 'snippet': 'snip 1', 'url': 'http://example.com/1',
-             'image_url': 'http://example.com/1.jpg', 'language': 'es', 'categories': ['tech'],
-             'relevance_score': 1.0, 'locale': 'us'},
-            {'uuid': '2', 'title': 'Noticia 2', 'source': 'fuente2', 'published_on': '2025-08-22T11:00:00',
-             'description': 'desc 2', 'keywords': 'k2', 'snippet': 'snip 2', 'url': 'http://example.org/2',
-             'image_url': 'http://example.org/2.jpg', 'language': 'en', 'categories': ['sports'],
-             'relevance_score': 2.0, 'locale': 'us'}
-        ]
-    }
-    fuentes_api_data = {
-        'data': [
-            {'source_id': 'fuente1', 'domain': 'Fuente Uno', 'language': 'es', 'locale': 'us', 'categories': ['cat1']},
-            {'source_id': 'fuente2', 'domain': 'Fuente Dos', 'language': 'en', 'locale': 'us', 'categories': ['cat2']}
-        ]
-    }
-
-    mock_noticias_response = MagicMock()
-    mock_noticias_response.raise_for_status.return_value = None
-    mock_noticias_response.json.return_value = noticias_api_data
-
-    mock_fuentes_response = MagicMock()
-    mock_fuentes_response.raise_for_status.return_value = None
-    mock_fuentes_response.json.return_value = fuentes_api_data
-
-    # Mockear el método get de la sesión para que devuelva las respuestas simuladas
-    mocker.patch.object(pipeline_instance.session, 'get', side_effect=[mock_noticias_response, mock_fuentes_response])
+    pipeline_instance = PipelineDeNoticias(data_lake_base=str(tmp_path_factory.mktemp('dl')))
+
+    # Mockear el método get de la sesión para que devuelva las respuestas simuladas.
+    # Las extracciones corren en paralelo, así que se responde según el endpoint
+    # consultado y no según el orden de llamada.
+    def get_simulado(url, **kwargs):
+        return _MOCK_NOTICIAS_RESPONSE if url.endswith('/news/top') else _MOCK_FUENTES_RESPONSE
+
+    module_mocker.patch.object(pipeline_instance.session, 'get', side_effect=get_simulado)
 
     return pipeline_instance
 
@@ -79,3 +109,10 @@ def test_ejecutar_pipeline_completo(pipeline_integracion):
 
     df_agregado = DeltaTable(pipeline_integracion.RUTA_GOLD_CONTEO_POR_FUENTE).to_pandas()
     assert len(df_agregado) == 2
+
+    # Verificar que los metadatos de la ejecución se guardaron en un único archivo
+    marca_tiempo = pipeline_integracion._marca_tiempo_ejecucion.strftime('%Y%m%d_%H%M%S')
+    with open(f"{pipeline_integracion.RUTA_LOGS}/run_{marca_tiempo}.json") as f:
+        metadatos = json.load(f)
+    # Las tablas Bronze se escriben en paralelo, así que su orden en el registro no es fijo
+    assert sorted(m['nombre_tabla'] for m in metadatos) == ['news_count_by_source', 'sources', 'top_stories', 'top_stories_enriched']
@@ -2,27 +2,58 @@
 Pruebas para el módulo de procesamiento de datos del pipeline.
 """
 
+import numpy as np
+import orjson
 import pytest
 import pandas as pd
+import pyarrow as pa
 from pandas.testing import assert_frame_equal
 import os
+import shutil
 from deltalake import DeltaTable
-from datetime import datetime
+from datetime import date
 
 # Importar la clase a probar desde el script principal
-from NicolasBarra_TP1 import PipelineDeNoticias
+from NicolasBarra_TP1 import PipelineDeNoticias, TIPO_FECHA_PARTICION
 
-@pytest.fixture
-def pipeline(tmp_path) -> PipelineDeNoticias:
-    """Fixture que provee una instancia del pipeline con un data lake temporal."""
-    pipeline_instance = PipelineDeNoticias()
-    pipeline_instance.DATA_LAKE_BASE = str(tmp_path)
-    pipeline_instance._crear_directorios_data_lake()
-    return pipeline_instance
+# Fechas de publicación de las noticias de prueba, parseadas una sola vez por NumPy
+_TS = np.array(['2025-08-22T10:00:00', '2025-08-22T11:00:00', '2025-08-22T11:00:00', '2025-08-22T12:00:00'], dtype='datetime64[ns]')
+
+# Columnas de texto de los datos de prueba (las constantes de extracción son categóricas)
+COLUMNAS_TEXTO_NOTICIAS = ['uuid', 'title', 'description', 'keywords', 'snippet', 'url', 'image_url', 'language', 'source', 'locale']
+COLUMNAS_TEXTO_FUENTES = ['source_id', 'domain', 'language', 'locale', 'categories']
+
+# Cantidad de noticias crudas de las pruebas parametrizadas. Los tamaños grandes
+# (marcados como benchmark) hacen visibles las regresiones de rendimiento.
+TAMANIOS = [4, 10_000, pytest.param(1_000_000, marks=pytest.mark.benchmark)]
+
+@pytest.fixture(scope="module")
+def pipeline_modulo(tmp_path_factory) -> PipelineDeNoticias:
+    """Instancia del pipeline con un data lake temporal, creada una sola vez por módulo."""
+    return PipelineDeNoticias(data_lake_base=str(tmp_path_factory.mktemp('dl')))
 
 @pytest.fixture
-def datos_de_prueba():
-    """Fixture que provee datos de prueba para noticias y fuentes con esquema completo."""
+def pipeline(pipeline_modulo) -> PipelineDeNoticias:
+    """
+    Fixture que provee la instancia compartida del pipeline con las capas Silver y Gold vacías.
+
+    Cada prueba sobreescribe las tablas Bronze que usa; las tablas derivadas se borran
+    para que ninguna prueba lea resultados de otra.
+    """
+    for ruta in (pipeline_modulo.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS, pipeline_modulo.RUTA_GOLD_CONTEO_POR_FUENTE):
+        shutil.rmtree(ruta, ignore_errors=True)
+    return pipeline_modulo
+
+def _make(n: int):
+    """
+    Construye datos de prueba para noticias y fuentes con esquema completo.
+
+    Las noticias son `n // 4` réplicas de una plantilla de 4 filas (con un uuid duplicado).
+    La réplica 0 conserva los uuid originales y el resto les agrega el sufijo '_<réplica>',
+    así que el procesamiento conserva 3 noticias por réplica.
+    """
+    # Una sola marca de tiempo de extracción, como en el pipeline, en un arreglo datetime64[ns] nativo
+    marca_extraccion = np.datetime64('now', 'ns')
     # Esquema completo de noticias crudas (20 columnas)
     noticias_crudas = pd.DataFrame({
         'uuid': ['a', 'b', 'b', 'c'],
@@ -30,20 +61,20 @@ def datos_de_prueba():
         'description': ['desc a', None, 'desc b', 'desc c'],
         'keywords': ['k1,k2', 'k3', 'k3', 'k4'],
         'snippet': ['snip a', 'snip b', 'snip b', 'snip c'],
-        'url': ['http://example.com/a', 'https://news.example.org/b', 'https://news.example.org/b', 'http://another.com/c'],
+        'url': ['http://example.com/a', 'https://news.example.org/b', 'https://news.example.org/b', 'another.com/c'],
         'image_url': ['http://example.com/a.jpg', 'https://news.example.org/b.jpg', 'https://news.example.org/b.jpg', 'http://another.com/c.jpg'],
         'language': ['es', 'en', 'en', 'es'],
-        'published_at': pd.to_datetime(['2025-08-22T10:00:00', '2025-08-22T11:00:00', '2025-08-22T11:00:00', '2025-08-22T12:00:00']),
+        'published_at': _TS,
         'source': ['fuente1', 'fuente2', 'fuente2', 'fuente1'],
         'categories': [['tech'], ['sports'], ['sports'], ['general']],
         'relevance_score': [1.0, 2.0, 2.0, 3.0],
         'locale': ['us', 'us', 'us', 'us'],
-        'fecha_extraccion': [datetime.now()] * 4, # Añadido por la función de extracción
-        'endpoint_origen': ['top_stories'] * 4, # Añadido por la función de extracción
-        'pais_consulta': ['us'] * 4, # Añadido por la función de extracción
-        'idioma_consulta': ['en'] * 4, # Añadido por la función de extracción
-        'fecha_publicacion': pd.to_datetime(['2025-08-22T10:00:00', '2025-08-22T11:00:00', '2025-08-22T11:00:00', '2025-08-22T12:00:00']),
-        'fecha_particion': [pd.to_datetime('2025-08-22').date()] * 4,
+        'fecha_extraccion': np.full(4, marca_extraccion), # Añadido por la función de extracción
+        'endpoint_origen': pd.Categorical(np.full(4, 'top_stories')), # Añadido por la función de extracción
+        'pais_consulta': pd.Categorical(np.full(4, 'us')), # Añadido por la función de extracción
+        'idioma_consulta': pd.Categorical(np.full(4, 'en')), # Añadido por la función de extracción
+        'fecha_publicacion': _TS,
+        'fecha_particion': pd.array([date(2025, 8, 22)] * 4, dtype=TIPO_FECHA_PARTICION),
         'hora_particion': [10, 11, 11, 12]
     })
 
@@ -54,91 +85,152 @@ def datos_de_prueba():
         'language': ['es', 'en'],
         'locale': ['us', 'us'],
         'categories': ['general', 'sports'],
-        'fecha_extraccion': [datetime.now()] * 2, # Añadido por la función de extracción
-        'endpoint_origen': ['sources'] * 2 # Añadido por la función de extracción
+        'fecha_extraccion': np.full(2, marca_extraccion), # Añadido por la función de extracción
+        'endpoint_origen': pd.Categorical(np.full(2, 'sources')) # Añadido por la función de extracción
     })
+
+    # Los textos se guardan como buffers UTF-8 de Arrow y no como objetos de Python
+    noticias_crudas = noticias_crudas.astype(dict.fromkeys(COLUMNAS_TEXTO_NOTICIAS, 'string[pyarrow]'))
+    fuentes_crudas = fuentes_crudas.astype(dict.fromkeys(COLUMNAS_TEXTO_FUENTES, 'string[pyarrow]'))
+
+    replicas = n // 4
+    if replicas > 1:
+        noticias_crudas = noticias_crudas.loc[noticias_crudas.index.repeat(replicas)].reset_index(drop=True)
+        replica = pd.Series(np.tile(np.arange(replicas), 4))
+        sufijos = ('_' + replica.astype('string[pyarrow]')).where(replica > 0, '')
+        noticias_crudas['uuid'] = noticias_crudas['uuid'] + sufijos
     return noticias_crudas, fuentes_crudas
 
+@pytest.fixture
+def datos_de_prueba():
+    """Fixture que provee datos de prueba para noticias y fuentes con esquema completo."""
+    return _make(4)
+
 
-def test_procesar_y_enriquecer_datos(pipeline, datos_de_prueba):
+@pytest.mark.parametrize('n', TAMANIOS)
+def test_procesar_y_enriquecer_datos(pipeline, n):
     """Prueba la lógica de procesamiento y enriquecimiento de datos."""
     # 1. Preparación (Arrange)
-    noticias_crudas, fuentes_crudas = datos_de_prueba
+    noticias_crudas, fuentes_crudas = _make(n)
     
-    pipeline.guardar_en_delta_lake(noticias_crudas, pipeline.RUTA_BRONZE_NOTICIAS, modo='overwrite')
-    pipeline.guardar_en_delta_lake(fuentes_crudas, pipeline.RUTA_BRONZE_FUENTES, modo='overwrite')
+    tabla_noticias = pipeline.guardar_en_delta_lake(
+        noticias_crudas, pipeline.RUTA_BRONZE_NOTICIAS, modo='overwrite', particionado_por=['fecha_particion'], devolver_tabla=True
+    )
+    tabla_fuentes = pipeline.guardar_en_delta_lake(fuentes_crudas, pipeline.RUTA_BRONZE_FUENTES, modo='overwrite', devolver_tabla=True)
 
-    # 2. Acción (Act)
+    # 2. Acción (Act): los datos crudos se toman de memoria, sin releer las tablas Bronze
     pipeline.procesar_y_enriquecer_datos(
         pipeline.RUTA_BRONZE_NOTICIAS,
         pipeline.RUTA_BRONZE_FUENTES,
-        pipeline.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS
+        pipeline.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS,
+        tabla_noticias_crudas=tabla_noticias,
+        tabla_fuentes_crudas=tabla_fuentes
     )
 
     # 3. Aserción (Assert)
     df_procesado = DeltaTable(pipeline.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS).to_pandas()
     assert not df_procesado.empty
-    assert len(df_procesado) == 3
+    assert len(df_procesado) == 3 * (n // 4)
     assert df_procesado['uuid'].is_unique
     assert 'fuente_id' in df_procesado.columns
     assert df_procesado.loc[df_procesado['uuid'] == 'a', 'es_titular_corto'].iloc[0] == True
     assert df_procesado.loc[df_procesado['uuid'] == 'b', 'es_titular_corto'].iloc[0] == False
-    def test_procesar_y_enriquecer_datos(pipeline, datos_de_prueba):
-    """Prueba la lógica de procesamiento y enriquecimiento de datos."""
-    # 1. Preparación (Arrange)
+    assert df_procesado.loc[df_procesado['uuid'] == 'b', 'description'].iloc[0] == 'Sin descripción'
+    assert df_procesado.loc[df_procesado['uuid'] == 'a', 'dominio_fuente'].iloc[0] == 'example.com'
+    # Como urlparse(...).netloc, una URL sin esquema no tiene dominio
+    assert df_procesado.loc[df_procesado['uuid'] == 'c', 'dominio_fuente'].iloc[0] == ''
+    assert 'fuente_nombre' in df_procesado.columns
+    assert df_procesado.loc[df_procesado['uuid'] == 'b', 'fuente_nombre'].iloc[0] == 'Fuente Dos'
+    assert df_procesado['es_titular_corto'].dtype == bool
+    assert pd.api.types.is_datetime64_any_dtype(df_procesado['fecha_publicacion'])
+
+def test_guardar_en_delta_lake_reemplaza_particionado_al_sobreescribir(pipeline, datos_de_prueba):
+    """Prueba que una sobreescritura completa reemplace el particionado de una tabla existente."""
+    _, fuentes_crudas = datos_de_prueba
+    # Tabla de fuentes con el particionado anterior, por 'categories' como texto
+    pipeline.guardar_en_delta_lake(fuentes_crudas, pipeline.RUTA_BRONZE_FUENTES, modo='overwrite', particionado_por=['categories'])
+
+    fuentes_con_listas = fuentes_crudas.assign(categories=pd.Series([['general'], ['sports']], dtype=pd.ArrowDtype(pa.list_(pa.string()))))
+    pipeline.guardar_en_delta_lake(fuentes_con_listas, pipeline.RUTA_BRONZE_FUENTES, modo='overwrite')
+
+    tabla = DeltaTable(pipeline.RUTA_BRONZE_FUENTES)
+    assert tabla.metadata().partition_columns == []
+    assert tabla.to_pyarrow_table()['categories'].to_pylist() == [['general'], ['sports']]
+
+def test_guardar_en_delta_lake_fuera_de_ejecucion_escribe_metadatos(pipeline, datos_de_prueba):
+    """Prueba que una escritura llamada directamente guarde sus metadatos sin esperar a `ejecutar_pipeline`."""
+    _, fuentes_crudas = datos_de_prueba
+    archivos_previos = set(os.listdir(pipeline.RUTA_LOGS))
+
+    pipeline.guardar_en_delta_lake(fuentes_crudas, pipeline.RUTA_BRONZE_FUENTES, modo='overwrite')
+
+    archivos_nuevos = set(os.listdir(pipeline.RUTA_LOGS)) - archivos_previos
+    assert len(archivos_nuevos) == 1
+    with open(os.path.join(pipeline.RUTA_LOGS, archivos_nuevos.pop()), 'rb') as f:
+        metadatos = orjson.loads(f.read())
+    assert [m['nombre_tabla'] for m in metadatos] == ['sources']
+    assert pipeline._registro_ejecucion == []
+
+def test_procesar_y_enriquecer_datos_por_particion(pipeline, datos_de_prueba):
+    """Prueba que al indicar una fecha solo se procesa (y reemplaza) esa partición diaria."""
     noticias_crudas, fuentes_crudas = datos_de_prueba
-    
-    pipeline.guardar_en_delta_lake(noticias_crudas, pipeline.RUTA_BRONZE_NOTICIAS, modo='overwrite')
+    noticia_dia_anterior = noticias_crudas.iloc[[0]].assign(
+        uuid='d',
+        fecha_publicacion=pd.Timestamp('2025-08-21T09:00:00'),
+        fecha_particion=pd.array([date(2025, 8, 21)], dtype=TIPO_FECHA_PARTICION),
+    )
+    noticias_dos_dias = pd.concat([noticias_crudas, noticia_dia_anterior], ignore_index=True)
     pipeline.guardar_en_delta_lake(fuentes_crudas, pipeline.RUTA_BRONZE_FUENTES, modo='overwrite')
 
-    # 2. Acción (Act)
-    df_procesado = pipeline.procesar_y_enriquecer_datos(
+    # Primera corrida completa: la capa Silver queda con las particiones 2025-08-21 y 2025-08-22
+    pipeline.guardar_en_delta_lake(noticias_dos_dias, pipeline.RUTA_BRONZE_NOTICIAS, modo='overwrite', particionado_por=['fecha_particion'])
+    pipeline.procesar_y_enriquecer_datos(
         pipeline.RUTA_BRONZE_NOTICIAS,
         pipeline.RUTA_BRONZE_FUENTES,
         pipeline.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS
     )
 
-    # 3. Aserción (Assert)
-    assert not df_procesado.empty
-    assert len(df_procesado) == 3
-    assert df_procesado['uuid'].is_unique
-    assert 'fuente_id' in df_procesado.columns
-    assert df_procesado.loc[df_procesado['uuid'] == 'a', 'es_titular_corto'].iloc[0] == True
-    assert df_procesado.loc[df_procesado['uuid'] == 'b', 'es_titular_corto'].iloc[0] == False
-    assert df_procesado.loc[df_procesado['uuid'] == 'b', 'description'].iloc[0] == 'Sin descripción'
-    assert df_procesado.loc[df_procesado['uuid'] == 'a', 'dominio_fuente'].iloc[0] == 'example.com'
-    assert 'fuente_nombre' in df_procesado.columns
-    assert df_procesado.loc[df_procesado['uuid'] == 'b', 'fuente_nombre'].iloc[0] == 'Fuente Dos'
-    assert df_procesado['es_titular_corto'].dtype == bool
-    assert df_procesado.loc[df_procesado['uuid'] == 'a', 'dominio_fuente'].iloc[0] == 'example.com'
-    assert 'fuente_nombre' in df_procesado.columns
-    assert df_procesado.loc[df_procesado['uuid'] == 'b', 'fuente_nombre'].iloc[0] == 'Fuente Dos'
-    assert df_procesado['es_titular_corto'].dtype == bool
+    # Los datos crudos de ambos días cambian, pero solo se reprocesa 2025-08-22
+    noticias_actualizadas = noticias_dos_dias.assign(title='Titular actualizado')
+    pipeline.guardar_en_delta_lake(noticias_actualizadas, pipeline.RUTA_BRONZE_NOTICIAS, modo='overwrite', particionado_por=['fecha_particion'])
+    pipeline.procesar_y_enriquecer_datos(
+        pipeline.RUTA_BRONZE_NOTICIAS,
+        pipeline.RUTA_BRONZE_FUENTES,
+        pipeline.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS,
+        fecha_particion=date(2025, 8, 22)
+    )
 
-def test_agregar_datos(pipeline, datos_de_prueba):
+    df_procesado = DeltaTable(pipeline.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS).to_pandas()
+    assert sorted(df_procesado['uuid']) == ['a', 'b', 'c', 'd']
+    assert set(df_procesado['fecha_particion']) == {date(2025, 8, 21), date(2025, 8, 22)}
+    titulos = df_procesado.set_index('uuid')['title']
+    # La partición reprocesada refleja los datos nuevos; la otra queda intacta
+    assert (titulos[['a', 'b', 'c']] == 'Titular actualizado').all()
+    assert titulos['d'] == 'Titular corto'
+
+@pytest.mark.parametrize('n', TAMANIOS)
+def test_agregar_datos(pipeline, n):
     """Prueba la lógica de agregación de datos."""
     # 1. Preparación
-    noticias_crudas, fuentes_crudas = datos_de_prueba
-    pipeline.guardar_en_delta_lake(noticias_crudas, pipeline.RUTA_BRONZE_NOTICIAS, modo='overwrite')
+    noticias_crudas, fuentes_crudas = _make(n)
+    pipeline.guardar_en_delta_lake(noticias_crudas, pipeline.RUTA_BRONZE_NOTICIAS, modo='overwrite', particionado_por=['fecha_particion'])
     pipeline.guardar_en_delta_lake(fuentes_crudas, pipeline.RUTA_BRONZE_FUENTES, modo='overwrite')
-    df_procesado = pipeline.procesar_y_enriquecer_datos(
+    pipeline.procesar_y_enriquecer_datos(
         pipeline.RUTA_BRONZE_NOTICIAS,
         pipeline.RUTA_BRONZE_FUENTES,
         pipeline.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS
     )
 
     # 2. Acción
-    pipeline.agregar_datos(df_procesado, pipeline.RUTA_GOLD_CONTEO_POR_FUENTE)
+    pipeline.agregar_datos(pipeline.RUTA_SILVER_NOTICIAS_ENRIQUECIDAS, pipeline.RUTA_GOLD_CONTEO_POR_FUENTE)
 
     # 3. Aserción
     df_agregado_leido = DeltaTable(pipeline.RUTA_GOLD_CONTEO_POR_FUENTE).to_pandas()
 
     df_esperado = pd.DataFrame({
         'fuente_nombre': ['Fuente Dos', 'Fuente Uno'],
-        'cantidad_noticias': [1, 2]
+        'cantidad_noticias': [n // 4, 2 * (n // 4)]
     })
 
-    df_agregado_leido = df_agregado_leido.sort_values(by='fuente_nombre').reset_index(drop=True)
-    df_esperado = df_esperado.sort_values(by='fuente_nombre').reset_index(drop=True)
-
+    # La tabla agregada se guarda ordenada por fuente, igual que `df_esperado`
     assert_frame_equal(df_agregado_leido, df_esperado, check_like=True)
\ No newline at end of file